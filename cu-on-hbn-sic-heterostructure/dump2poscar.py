@@ -1,7 +1,49 @@
 #!/usr/bin/env python3
 import argparse
+import os
+from io import StringIO
+import numpy as np
 from ase.io import read, write
 
+def build_frame_index(dump_file, index_file):
+    """Scan the extxyz file once and store the byte offset of every frame.
+
+    The last entry is the file size, so frame i spans offsets[i]:offsets[i + 1].
+    """
+    offsets = []
+    with open(dump_file, 'rb') as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line.strip():
+                break
+            offsets.append(offset)
+            # Skip the comment line and one line per atom.
+            for _ in range(int(line) + 1):
+                f.readline()
+        offsets.append(f.tell())
+
+    offsets = np.array(offsets, dtype=np.int64)
+    with open(index_file, 'wb') as f:
+        np.save(f, offsets)
+    return offsets
+
+def load_frame_index(dump_file, index_file):
+    """Load the frame offsets, rebuilding them if the index is missing or older than the dump."""
+    if os.path.isfile(index_file) and os.path.getmtime(index_file) >= os.path.getmtime(dump_file):
+        with open(index_file, 'rb') as f:
+            return np.load(f)
+    return build_frame_index(dump_file, index_file)
+
+def read_frame(dump_file, indx):
+    """Read a single frame by seeking straight to its offset instead of parsing all earlier frames."""
+    offsets = load_frame_index(dump_file, f'{dump_file}.idx')
+    frame = range(len(offsets) - 1)[indx]
+    with open(dump_file, 'rb') as f:
+        f.seek(offsets[frame])
+        chunk = f.read(offsets[frame + 1] - offsets[frame]).decode()
+    return read(StringIO(chunk), format='extxyz')
+
 def main():
     parser = argparse.ArgumentParser(description="Convert frame from dump.xyz to VASP POSCAR")
     parser.add_argument('indx', type=int, help='Frame index to read from dump.xyz')
@@ -9,7 +51,7 @@ def main():
     args = parser.parse_args()
     indx = args.indx
 
-    dump = read('dump.xyz', format='extxyz', index=f'{indx}')
+    dump = read_frame('dump.xyz', indx)
     write(f'POSCAR-{indx}', dump, format='vasp', direct=True, sort=True)
 
 if __name__ == "__main__":
@@ -1,12 +1,372 @@
 import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import groupby
 from ase.io import read, write
-from typing import List
+from ase.io.formats import open_with_compression
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
 import numpy as np
-import random
+from numpy.random import Generator, SeedSequence, SFC64
 from pathlib import Path
 from ase import Atoms
-import copy
+
+def _read_xdatcar(file_path: Path, step_size: int) -> List[Atoms]:
+    """
+    Read every `step_size`-th frame of an XDATCAR file.
+
+    Follows `ase.io.vasp.read_vasp_xdatcar`, including XDATCARs of variable-cell runs that repeat
+    the header before every frame, but skips the coordinate lines of unselected frames instead of
+    building an Atoms object for each of them. Compressed files (.gz, .bz2, .xz) are opened
+    the same way ASE opens them.
+
+    Parameters:
+        file_path (Path): Path to the XDATCAR file.
+        step_size (int): Interval between the frames to read.
+
+    Returns:
+        List[Atoms]: The selected frames.
+    """
+    images = []
+    cell = np.eye(3)
+    atomic_formula = ''
+    total = 0
+    frame = 0
+
+    with open_with_compression(os.fspath(file_path), 'r') as fd:
+        while True:
+            comment_line = fd.readline()
+            if "Direct configuration=" not in comment_line:
+                try:
+                    lattice_constant = float(fd.readline())
+                except ValueError:
+                    break
+
+                cell = np.array([fd.readline().split() for _ in range(3)], dtype=float) * lattice_constant
+                symbols = fd.readline().split()
+                numbers = [int(n) for n in fd.readline().split()]
+                total = sum(numbers)
+                atomic_formula = ''.join(f'{symbol}{number}' for symbol, number in zip(symbols, numbers))
+                fd.readline()
+
+            if frame % step_size:
+                for _ in range(total):
+                    fd.readline()
+            else:
+                coords = np.array([fd.readline().split()[:3] for _ in range(total)], dtype=float)
+                image = Atoms(atomic_formula, cell=cell, pbc=True)
+                image.set_scaled_positions(coords)
+                images.append(image)
+            frame += 1
+
+    return images
+
+def _symbol_count(symbols: Sequence[str]) -> List[Tuple[str, int]]:
+    """
+    Reduce a list of chemical symbols to (symbol, count) pairs of consecutive runs, as in a POSCAR header.
+
+    Parameters:
+        symbols (Sequence[str]): Chemical symbols in atom order.
+
+    Returns:
+        List[Tuple[str, int]]: e.g. [('Si', 2), ('C', 2)] for ['Si', 'Si', 'C', 'C'].
+    """
+    return [(symbol, len(list(group))) for symbol, group in groupby(symbols)]
+
+def _format_poscar(
+    cell: np.ndarray,
+    scaled_positions: np.ndarray,
+    symbol_count: List[Tuple[str, int]]
+) -> bytes:
+    """
+    Format a POSCAR file with direct coordinates, byte-for-byte as `ase.io.write(..., format='vasp', direct=True)`.
+
+    The positions block is formatted by a single `%` operation over the flattened array
+    instead of a Python loop over atoms.
+
+    Parameters:
+        cell (np.ndarray): 3x3 array of cell vectors.
+        scaled_positions (np.ndarray): Nx3 array of fractional coordinates.
+        symbol_count (List[Tuple[str, int]]): (symbol, count) pairs in atom order.
+
+    Returns:
+        bytes: The POSCAR file content.
+    """
+    header = ' '.join(f'{symbol:2s}' for symbol, _ in symbol_count) + '\n'
+    header += f'{1.0:19.16f}\n'
+    header += ('  %21.16f %21.16f %21.16f\n' * 3) % tuple(np.ravel(cell).tolist())
+    header += ' ' + ' '.join(f'{symbol:3s}' for symbol, _ in symbol_count) + '\n '
+    header += ' '.join(f'{count:3d}' for _, count in symbol_count) + '\n'
+    header += 'Direct\n'
+    body = (' %19.16f %19.16f %19.16f\n' * len(scaled_positions)) % tuple(np.ravel(scaled_positions).tolist())
+    return (header + body).encode()
+
+# Descriptor of the output directory in a writer process, see `_open_output_dir`.
+_output_dir_fd: Optional[int] = None
+
+def _open_output_dir(output_dir: str) -> None:
+    """
+    Open the output directory once per writer process, so files can be created relative
+    to its descriptor without resolving the directory path for every file.
+    Does nothing on platforms without `dir_fd` support (e.g. Windows).
+
+    Parameters:
+        output_dir (str): Directory the POSCAR files are written into.
+    """
+    global _output_dir_fd
+    if hasattr(os, 'O_DIRECTORY') and os.open in os.supports_dir_fd:
+        _output_dir_fd = os.open(output_dir, os.O_RDONLY | os.O_DIRECTORY)
+
+def _write_bytes(output_dir: str, file_name: str, content: bytes) -> None:
+    """
+    Write `content` to `file_name` in `output_dir` with unbuffered os-level calls.
+
+    Parameters:
+        output_dir (str): Directory to write the file into.
+        file_name (str): Name of the file to (over)write.
+        content (bytes): The file content.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    if _output_dir_fd is not None:
+        fd = os.open(file_name, flags, 0o644, dir_fd=_output_dir_fd)
+    else:
+        fd = os.open(f'{output_dir}{os.sep}{file_name}', flags, 0o644)
+    try:
+        view = memoryview(content)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _write_poscar_arrays(
+    output_dir: str,
+    file_name: str,
+    cell: np.ndarray,
+    positions: np.ndarray,
+    symbol_count: List[Tuple[str, int]]
+) -> None:
+    """
+    Write a POSCAR file in direct coordinates from raw arrays, without an Atoms object.
+
+    Parameters:
+        output_dir (str): Directory to write the POSCAR file into.
+        file_name (str): Name of the POSCAR file.
+        cell (np.ndarray): 3x3 array of cell vectors.
+        positions (np.ndarray): Nx3 array of Cartesian positions.
+        symbol_count (List[Tuple[str, int]]): (symbol, count) pairs in atom order.
+
+    Raises:
+        IOError: If the file cannot be written to the specified directory.
+    """
+    try:
+        scaled_positions = np.linalg.solve(cell.T, positions.T).T
+        _write_bytes(output_dir, file_name, _format_poscar(cell, scaled_positions, symbol_count))
+    except IOError as e:
+        raise IOError(f"Failed to write POSCAR file at {output_dir}{os.sep}{file_name}. Error: {e}")
+
+def _write_one(
+    output_dir: str,
+    atoms_obj: Atoms,
+    structure_id: int,
+    symbol_count: Optional[List[Tuple[str, int]]] = None
+) -> None:
+    """
+    Write a single POSCAR file for the given atomic structure.
+
+    Parameters:
+        output_dir (str): Directory to write the POSCAR file into.
+        atoms_obj (Atoms): The ASE Atoms object representing the atomic structure.
+        structure_id (int): A unique identifier for the structure. This will be appended to the file name.
+        symbol_count (List[Tuple[str, int]], optional): Precomputed (symbol, count) header of `atoms_obj`.
+
+    Raises:
+        IOError: If the file cannot be written to the specified directory.
+    """
+    file_name = f'POSCAR-{structure_id}'
+
+    # Selective dynamics and velocities are only supported by the ASE writer.
+    if atoms_obj.constraints or atoms_obj.has('momenta'):
+        file_path = f'{output_dir}{os.sep}{file_name}'
+        try:
+            write(file_path, atoms_obj, format='vasp', direct=True)
+        except IOError as e:
+            raise IOError(f"Failed to write POSCAR file at {file_path}. Error: {e}")
+        return
+
+    if symbol_count is None:
+        symbol_count = _symbol_count(atoms_obj.get_chemical_symbols())
+    _write_poscar_arrays(output_dir, file_name, atoms_obj.cell.array, atoms_obj.positions, symbol_count)
+
+def _deform_cells(cells: np.ndarray, strains: np.ndarray) -> np.ndarray:
+    """
+    Apply strains elementwise to cell vectors: `cells * (1 + strains)`.
+
+    Parameters:
+        cells (np.ndarray): A 3x3 cell or an (n, 3, 3) stack of cells.
+        strains (np.ndarray): Strain matrices with the same shape as `cells`.
+
+    Returns:
+        np.ndarray: The deformed cell(s).
+    """
+    deformed = strains + 1.0
+    deformed *= cells
+    return deformed
+
+def _deform_positions(cell: np.ndarray, positions: np.ndarray, deformed_cell: np.ndarray) -> np.ndarray:
+    """
+    Move Cartesian positions with their cell, keeping fractional coordinates fixed,
+    as `Atoms.set_cell(deformed_cell, scale_atoms=True)` does.
+
+    Parameters:
+        cell (np.ndarray): 3x3 original cell.
+        positions (np.ndarray): Nx3 Cartesian positions in `cell`.
+        deformed_cell (np.ndarray): 3x3 deformed cell.
+
+    Returns:
+        np.ndarray: Nx3 Cartesian positions in `deformed_cell` (`positions` itself if the cell is unchanged).
+    """
+    if np.array_equal(deformed_cell, cell):
+        return positions
+    return positions @ np.linalg.solve(cell, deformed_cell)
+
+def _rattle_positions(
+    rng: Generator,
+    base_positions: np.ndarray,
+    amplitude: float,
+    displacement: np.ndarray,
+    out: np.ndarray
+) -> np.ndarray:
+    """
+    Add normally distributed displacements of standard deviation `amplitude` to `base_positions`.
+
+    The displacements are drawn in single precision, which is plenty for ~0.1 Angstrom, into the
+    reusable float32 buffer `displacement` and upcast when added into `out`.
+
+    Parameters:
+        rng (Generator): Generator to draw the displacements from.
+        base_positions (np.ndarray): Nx3 Cartesian positions to rattle.
+        amplitude (float): Standard deviation of the displacements.
+        displacement (np.ndarray): Nx3 float32 buffer for the displacements.
+        out (np.ndarray): Nx3 float64 array receiving the rattled positions; may be `base_positions`.
+
+    Returns:
+        np.ndarray: `out`.
+    """
+    rng.standard_normal(dtype=np.float32, out=displacement)
+    displacement *= np.float32(amplitude)
+    return np.add(base_positions, displacement, out=out)
+
+# Below this many POSCAR files, starting worker processes costs more than it saves.
+_MIN_FILES_FOR_POOL = 64
+
+class _WriteTask(NamedTuple):
+    """
+    One input structure to write, together with its deformed and rattled copies.
+
+    Attributes:
+        structure_id (int): Identifier of the original structure; deformed/rattled copies follow consecutively.
+        cell (np.ndarray): 3x3 cell of the original structure.
+        positions (np.ndarray): Nx3 Cartesian positions of the original structure.
+        symbol_count (List[Tuple[str, int]]): (symbol, count) header shared by all written structures.
+        deformed_cell (np.ndarray, optional): 3x3 deformed cell; atoms keep their fractional coordinates.
+            None if only the original structure is written.
+        amplitudes (np.ndarray, optional): Displacement amplitude of every rattling, shape (number_of_rattling,).
+            None if the deformed structure is written once without rattling.
+        seed_sequence (SeedSequence): Seed of the SFC64 generator the displacements are drawn from.
+        atoms_obj (Atoms, optional): The original structure, only set when it has constraints or
+            velocities, which are written through ASE.
+    """
+    structure_id: int
+    cell: np.ndarray
+    positions: np.ndarray
+    symbol_count: List[Tuple[str, int]]
+    deformed_cell: Optional[np.ndarray]
+    amplitudes: Optional[np.ndarray]
+    seed_sequence: SeedSequence
+    atoms_obj: Optional[Atoms]
+
+def _iter_configurations(task: _WriteTask) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Yield the original, deformed and rattled configurations of a write task.
+
+    The displacements of every rattling are drawn from a generator seeded with `task.seed_sequence`
+    into one reused buffer and the rattled positions into another, so the yielded positions are
+    only valid until the next iteration.
+
+    Parameters:
+        task (_WriteTask): The structure to expand.
+
+    Yields:
+        Tuple[int, np.ndarray, np.ndarray, np.ndarray]: Structure id, cell, Cartesian positions, and
+        the unrattled positions they were derived from.
+    """
+    yield task.structure_id, task.cell, task.positions, task.positions
+    if task.deformed_cell is None:
+        return
+
+    base_positions = _deform_positions(task.cell, task.positions, task.deformed_cell)
+
+    if task.amplitudes is None:
+        yield task.structure_id + 1, task.deformed_cell, base_positions, base_positions
+        return
+
+    rng = Generator(SFC64(task.seed_sequence))
+    displacement = np.empty(base_positions.shape, dtype=np.float32)
+    positions_buffer = np.empty_like(base_positions)
+    for j, amplitude in enumerate(task.amplitudes, start=1):
+        _rattle_positions(rng, base_positions, amplitude, displacement, positions_buffer)
+        yield task.structure_id + j, task.deformed_cell, positions_buffer, base_positions
+
+def _write_task_arrays(output_dir: str, task: _WriteTask) -> None:
+    """
+    Write all configurations of a task from raw arrays, without creating Atoms objects.
+
+    Parameters:
+        output_dir (str): Directory to write the POSCAR files into.
+        task (_WriteTask): The structure to write.
+
+    Raises:
+        IOError: If a file cannot be written to the specified directory.
+    """
+    for structure_id, cell, positions, _ in _iter_configurations(task):
+        _write_poscar_arrays(output_dir, f'POSCAR-{structure_id}', cell, positions, task.symbol_count)
+
+def _write_task_with_ase(output_dir: str, task: _WriteTask) -> None:
+    """
+    Write all configurations of a task through `task.atoms_obj` and the ASE writer,
+    which keeps selective dynamics and velocities. Constrained atoms are not rattled.
+
+    Parameters:
+        output_dir (str): Directory to write the POSCAR files into.
+        task (_WriteTask): The structure to write; `task.atoms_obj` must be set.
+
+    Raises:
+        IOError: If a file cannot be written to the specified directory.
+    """
+    # Work on a copy so the caller's structure is left untouched when run in-process.
+    atoms_obj = task.atoms_obj.copy()
+    for structure_id, cell, positions, base_positions in _iter_configurations(task):
+        atoms_obj.set_cell(cell)
+        atoms_obj.set_positions(base_positions, apply_constraint=False)
+        atoms_obj.set_positions(positions)
+        _write_one(output_dir, atoms_obj, structure_id, task.symbol_count)
+
+def _write_task(output_dir: str, task: _WriteTask) -> None:
+    """
+    Write an input structure followed by its deformed and rattled copies. Kept at module level
+    so it can run in worker processes.
+
+    Parameters:
+        output_dir (str): Directory to write the POSCAR files into.
+        task (_WriteTask): The structure to write.
+
+    Raises:
+        IOError: If a file cannot be written to the specified directory.
+    """
+    if task.atoms_obj is not None:
+        _write_task_with_ase(output_dir, task)
+    else:
+        _write_task_arrays(output_dir, task)
 
 class CrystalConfigurationGenerator:
     """
@@ -21,10 +381,15 @@ class CrystalConfigurationGenerator:
         start_structure_id (int, optional): Starting ID for generated structures. Default is 1.
         number_of_rattling (int, optional): Number of rattling for each structure. Defaul is 1.
         step_size (int, optional): Interval for selecting a configuration from list of structures.
+        max_workers (int, optional): Number of processes used to write POSCAR files. Default is the number of CPUs.
+        seed (int, optional): Seed of the SFC64 random generator. All strains and displacements are drawn
+            from this single stream, so a fixed seed reproduces a run. Default is None (fresh entropy).
 
     Raises:
         FileNotFoundError: If the file_path does not point to an existing file.
-        ValueError: If max_strain or max_amplitude is not between 0 and 1.
+        ValueError: If max_strain or max_amplitude is not between 0 and 1, if start_structure_id is not
+            greater than 0, if step_size is not a positive integer, if number_of_rattling is not a
+            non-negative integer, or if max_workers is given and is not a positive integer.
     """
     def __init__(
         self,
@@ -34,7 +399,9 @@ class CrystalConfigurationGenerator:
         max_amplitude: float = 0.1,
         start_structure_id: int = 1,
         number_of_rattling: int = 1,
-        step_size: int = 10
+        step_size: int = 10,
+        max_workers: Optional[int] = None,
+        seed: Optional[int] = None
         
     ) -> None:
 
@@ -46,9 +413,9 @@ class CrystalConfigurationGenerator:
             raise ValueError(f"max_amplitude must be between 0 and 1. Got {max_amplitude}.")
         self.max_amplitude = max_amplitude
         
-        if not vasp_file.is_file():
-            raise FileNotFoundError(f"The file at path {self.file_path} does not exist.")
         self.file_path = Path(vasp_file)
+        if not self.file_path.is_file():
+            raise FileNotFoundError(f"The file at path {self.file_path} does not exist.")
         
         if not (start_structure_id > 0):
             raise ValueError(f"Minimum 'start_structure_id' must be 0. Got {start_structure_id}.")
@@ -56,51 +423,100 @@ class CrystalConfigurationGenerator:
 
         if not isinstance(step_size, int):
             raise ValueError(f"step_size must be an integer. Got {type(step_size).__name__}")
+        if not (step_size > 0):
+            raise ValueError(f"step_size must be greater than 0. Got {step_size}.")
         self.step_size = step_size
 
         if not isinstance(number_of_rattling, int):
             raise ValueError(f"number_of_rattling must be an integer. Got {type(number_of_rattling).__name__}")
+        if not (number_of_rattling >= 0):
+            raise ValueError(f"number_of_rattling must be 0 or greater. Got {number_of_rattling}.")
         self.number_of_rattling = number_of_rattling
 
-        self.output_dir = output_dir
+        self.output_dir = Path(output_dir)
+        # String form of the output directory, so it is not re-converted for every file written.
+        self._out_str = os.fspath(self.output_dir)
+
+        if max_workers is not None and not (isinstance(max_workers, int) and max_workers > 0):
+            raise ValueError(f"max_workers must be a positive integer. Got {max_workers}.")
+        self.max_workers = max_workers or os.cpu_count()
+
+        # SFC64 is faster than the default PCG64 and good enough for structure rattling.
+        # The SeedSequence is kept to spawn the child streams of the writer processes.
+        self._seed_seq = SeedSequence(seed)
+        self._rng = Generator(SFC64(self._seed_seq))
+
+        # POSCAR header of the last seen composition; frames of an XDATCAR all share it.
+        self._cached_numbers = None
+        self._cached_symbol_count = None
         
-    @staticmethod
-    def get_seed(limit=999) -> int:
+    def get_symbol_count(self, atoms_obj: Atoms) -> List[Tuple[str, int]]:
         """
-        Generate a random integer seed up to a given limit.
+        Return the (symbol, count) POSCAR header of a structure, reusing it while the composition does not change.
 
         Parameters:
-            limit (int): Maximum number for the seed.
+            atoms_obj (Atoms): The ASE Atoms object representing the atomic structure.
 
         Returns:
-            int: Random seed.
+            List[Tuple[str, int]]: (symbol, count) pairs of consecutive runs of chemical symbols.
         """
-        return random.randint(0, limit)
+        numbers = atoms_obj.get_atomic_numbers()
+        if self._cached_numbers is None or not np.array_equal(numbers, self._cached_numbers):
+            self._cached_numbers = numbers
+            self._cached_symbol_count = _symbol_count(atoms_obj.get_chemical_symbols())
+        return self._cached_symbol_count
 
-    def generate_strain_matrix(self) -> np.ndarray:
+    def generate_strain_matrix(self, number_of_structures: Optional[int] = None) -> np.ndarray:
         """
-        Generate a random 3x3 strain matrix.
+        Generate a random 3x3 strain matrix, or a stack of them.
+
+        Parameters:
+            number_of_structures (int, optional): If given, draw one matrix per structure at once.
         
         Returns:
-            np.ndarray: A 3x3 array of random numbers between `-self.max_strain` and `self.max_strain`.
+            np.ndarray: A 3x3 (or number_of_structures x 3 x 3) array of random numbers between
+            `-self.max_strain` and `self.max_strain`.
+        """
+        size = (3, 3) if number_of_structures is None else (number_of_structures, 3, 3)
+        return self._rng.uniform(-self.max_strain, self.max_strain, size=size)
+
+    def get_rattled_displacement_amplitude(self, size: Optional[Tuple[int, ...]] = None):
+        """
+        Generate a random displacement amplitude, or an array of them.
+
+        Parameters:
+            size (Tuple[int, ...], optional): If given, shape of the array of amplitudes drawn at once.
+
+        Returns:
+            float or np.ndarray: Random displacement amplitude(s) between 0 and 'self.max_amplitude'.
         """
-        rng = np.random.default_rng()
-        return rng.uniform(-self.max_strain, self.max_strain, size=(3, 3))
+        return self._rng.uniform(0.0, self.max_amplitude, size=size)
 
-    def get_rattled_displacement_amplitude(self) -> float:
+    def get_file_format(self) -> Optional[str]:
         """
-        Generate a random displacement amplitude.
+        Determine the ASE format of the input file from its name.
 
         Returns:
-            float: A random displacement amplitude between 0 and 'self.max_amplitude'.
+            Optional[str]: 'vasp-xdatcar' for XDATCAR files, 'vasp' for POSCAR/CONTCAR files,
+            or None to let ASE detect the format from the file content.
         """
-        rng = np.random.default_rng()
-        return rng.uniform(0.0, self.max_amplitude)
+        name = self.file_path.name.upper()
+        if 'XDATCAR' in name:
+            return 'vasp-xdatcar'
+        if 'POSCAR' in name or 'CONTCAR' in name:
+            return 'vasp'
+        return None
 
-    def read_vasp_file(self) -> List:
+    def read_vasp_file(self, step_size: Optional[int] = None) -> List:
         """
-        Read and return the content of a VASP file.
+        Read and return every `step_size`-th structure of a VASP file.
+
+        XDATCAR files are parsed by `_read_xdatcar`, which skips unselected frames; ASE's XDATCAR
+        reader would build every frame before applying the stride.
         
+        Parameters:
+            step_size (int, optional): Interval between the structures to read. Default is `self.step_size`.
+
         Returns:
             List: A list of structures (atoms objects) read from the VASP file.
         
@@ -108,7 +524,16 @@ class CrystalConfigurationGenerator:
             IOError: If the file cannot be read for other reasons.
         """
         try:
-            return read(self.file_path, index=":")
+            if step_size is None:
+                step_size = self.step_size
+            file_format = self.get_file_format()
+            if file_format == 'vasp-xdatcar':
+                return _read_xdatcar(self.file_path, step_size)
+            return read(
+                self.file_path,
+                index=slice(None, None, step_size),
+                format=file_format
+            )
         except IOError as e:
             raise IOError(f"An unexpected error occurred while reading the file at {self.file_path}: {e}")
 
@@ -139,45 +564,36 @@ class CrystalConfigurationGenerator:
             structure_id (int): A unique identifier for the structure. This will be appended to the file name.
             
         Raises:
-            ValueError: `atoms_obj` is not an instance of `Atoms`.
             IOError: If the file cannot be written to the specified directory.
         """
-        if not isinstance(atoms_obj, Atoms):
-            raise ValueError("The provided `atoms_obj` must be an instance of `ase.Atoms`.")
-
-        file_path = os.path.join(self.output_dir, f'POSCAR-{structure_id}')
-        
-        try:
-            write(file_path, atoms_obj, format='vasp', direct=True)
-        except IOError as e:
-            raise IOError(f"Failed to write POSCAR file at {file_path}. Error: {e}")
+        _write_one(self._out_str, atoms_obj, structure_id, self.get_symbol_count(atoms_obj))
 
     def apply_cell_deformation(self, atoms_obj: Atoms) -> Atoms:
         """
         Apply a deformative strain to the cell vectors of the given atomic structure.
+
+        Uses the same deformation as `process()`; atoms keep their fractional coordinates.
         
         Parameters:
             atoms_obj (Atoms): The ASE Atoms object representing the atomic structure.
 
         Returns:
             Atoms: The modified Atoms object with deformed cell vectors.
-
-        Raises:
-            ValueError: If `atoms_obj` is not an instance of `ase.Atoms`.
         """
-        if not isinstance(atoms_obj, Atoms):
-            raise ValueError("The provided `atoms_obj` must be an instance of `ase.Atoms`.")
-
-        current_cell = atoms_obj.get_cell()
-        strain_matrix = self.generate_strain_matrix()
-        deformed_cell = current_cell * (1 + strain_matrix)
+        current_cell = atoms_obj.cell.array
+        deformed_cell = _deform_cells(current_cell, self.generate_strain_matrix())
+        positions = _deform_positions(current_cell, atoms_obj.positions, deformed_cell)
         
-        atoms_obj.set_cell(deformed_cell, scale_atoms=True)
+        atoms_obj.set_cell(deformed_cell)
+        atoms_obj.set_positions(positions, apply_constraint=False)
         return atoms_obj
     
     def rattle_structure(self, atoms_obj: Atoms) -> Atoms:
         """
         Apply random displacements (rattling) to the atomic positions.
+
+        Uses the same rattling as `process()`, drawing from the shared generator rather than with
+        `Atoms.rattle`, which seeds a new legacy `RandomState` on every call.
         
         Parameters:
             atoms_obj (Atoms): The ASE Atoms object representing the atomic structure.
@@ -186,16 +602,13 @@ class CrystalConfigurationGenerator:
             Atoms: The modified Atoms object with rattled geometry.
             
         Raises:
-            ValueError: If `atoms_obj` is not an instance of `ase.Atoms`.
             RuntimeError: If an error occurs during the rattling process.
         """
-        if not isinstance(atoms_obj, Atoms):
-            raise ValueError("The provided `atoms_obj` must be an instance of `ase.Atoms`.")
-        
         try:
-            displacement_amplitude = self.get_rattled_displacement_amplitude()
-            random_seed = self.get_seed()
-            atoms_obj.rattle(stdev=displacement_amplitude, seed=random_seed)
+            positions = atoms_obj.get_positions()
+            displacement = np.empty(positions.shape, dtype=np.float32)
+            _rattle_positions(self._rng, positions, self.get_rattled_displacement_amplitude(), displacement, positions)
+            atoms_obj.set_positions(positions)
             return atoms_obj
         except Exception as e:
             raise RuntimeError(f"Failed to rattle the atomic structure: {e}")
@@ -210,28 +623,79 @@ class CrystalConfigurationGenerator:
             2.2. Rattles the atomic geometry to introduce random displacements.
             2.3. Saves the deformed and rattled structure to the output directory.
 
+        The POSCAR files are written in parallel by up to `self.max_workers` processes
+        (at most one per input structure); small runs are written in this process.
+
         Raises:
             RuntimeError: If any critical step in the process fails.
         """
         try:
-            vaspcar = self.read_vasp_file()
+            structures = self.read_vasp_file()
             self.create_output_directory()
             structure_id = self.start_structure_id
         except Exception as e:
             raise RuntimeError(f"Error during initialization: {e}")
-        
-        interval = self.step_size
-        for i, atoms in enumerate(vaspcar[::interval]):
-            self.write_poscar(atoms, structure_id)
-            structure_id += 1
-            
-            if self.max_strain != 0.0 or self.max_amplitude != 0:
-                atoms = self.apply_cell_deformation(atoms)
-                for j in range(self.number_of_rattling):
-                    deformed_atoms = copy.deepcopy(atoms)
-                    rattled_atoms = self.rattle_structure(deformed_atoms)
-                    self.write_poscar(rattled_atoms, structure_id)
-                    structure_id += 1
+
+        # Draw all random numbers for the run at once instead of per structure.
+        nstruct = len(structures)
+        strains = self.generate_strain_matrix(nstruct)
+        amplitudes = self.get_rattled_displacement_amplitude((nstruct, self.number_of_rattling))
+        # The displacements are drawn in the writer processes, each structure from its own child
+        # stream, so they are never all held in memory and a fixed seed still reproduces the run.
+        seed_sequences = self._seed_seq.spawn(nstruct)
+
+        # Deform all cells with one elementwise operation over the (nstruct, 3, 3) stack.
+        if nstruct:
+            deformed_cells = _deform_cells(np.stack([atoms.cell.array for atoms in structures]), strains)
+
+        # One write task per input structure, built from its cell, positions and species
+        # plus, if requested, the deformed cell and the amplitudes of every rattling.
+        tasks = []
+        for i, atoms in enumerate(structures):
+            if self.number_of_rattling == 0 or (self.max_strain == 0.0 and self.max_amplitude == 0.0):
+                # Nothing to deform or rattle: only the original structure is written.
+                deformed_cell, task_amplitudes, ncopies = None, None, 0
+            else:
+                deformed_cell = deformed_cells[i] if self.max_strain != 0.0 else atoms.cell.array
+                if self.max_amplitude != 0.0:
+                    task_amplitudes, ncopies = amplitudes[i], self.number_of_rattling
+                else:
+                    # Without rattling every copy would be identical, so the deformed structure is written once.
+                    task_amplitudes, ncopies = None, 1
+
+            tasks.append(_WriteTask(
+                structure_id=structure_id,
+                cell=atoms.cell.array,
+                positions=atoms.positions,
+                symbol_count=self.get_symbol_count(atoms),
+                deformed_cell=deformed_cell,
+                amplitudes=task_amplitudes,
+                seed_sequence=seed_sequences[i],
+                # Constraints and velocities can only be written through ASE, so keep the Atoms for those.
+                atoms_obj=atoms if atoms.constraints or atoms.has('momenta') else None
+            ))
+            structure_id += 1 + ncopies
+
+        nfiles = structure_id - self.start_structure_id
+        max_workers = min(self.max_workers, nstruct)
+        try:
+            if max_workers <= 1 or nfiles < _MIN_FILES_FOR_POOL:
+                for task in tasks:
+                    _write_task(self._out_str, task)
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_open_output_dir,
+                    initargs=(self._out_str,)
+                ) as executor:
+                    # Consume the iterator so errors raised in the workers surface here.
+                    list(executor.map(
+                        partial(_write_task, self._out_str),
+                        tasks,
+                        chunksize=max(1, nstruct // (4 * max_workers))
+                    ))
+        except Exception as e:
+            raise RuntimeError(f"Error while writing POSCAR files: {e}")
         print("Processing completed successfully.")
 
 def main() -> None:
@@ -269,6 +733,14 @@ def main() -> None:
         "--step_size", type=int, default=1,
         help="Interval to extract structures from XDATCAR. Default is 1."
     )
+    parser.add_argument(
+        "--max_workers", type=int, default=None,
+        help="Number of processes used to write POSCAR files. Default is the number of CPUs."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="Seed of the random number generator, for reproducible runs. Default is None."
+    )
 
     args = parser.parse_args()
 
@@ -280,7 +752,9 @@ def main() -> None:
             start_structure_id=args.start_structure_id,
             output_dir=args.output_dir,
             number_of_rattling=args.number_of_rattling,
-            step_size=args.step_size
+            step_size=args.step_size,
+            max_workers=args.max_workers,
+            seed=args.seed
         )
         processor.process()
     except Exception as e: